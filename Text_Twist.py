@@ -1,9 +1,16 @@
+import functools
+import heapq
 import pygame
 import random
-import sys
+import string
 import json
 import os
-from itertools import permutations
+from itertools import combinations
+
+# Nudge SDL's renderer toward vsync before init (the env name SDL reads is
+# SDL_RENDER_VSYNC); set_mode in run() makes the actual request and falls
+# back when it is refused. setdefault keeps a user's own setting intact.
+os.environ.setdefault("SDL_RENDER_VSYNC", "1")
 
 pygame.init()
 
@@ -14,6 +21,7 @@ LETTER_BOX_SIZE = 35
 BUTTON_SIZE = 52
 BUTTON_MARGIN = 12
 FPS = 60
+TIMER_EVENT = pygame.USEREVENT + 1  # 1 Hz countdown tick from SDL
 
 # Colors
 WHITE = (250, 250, 250)
@@ -31,14 +39,35 @@ GOLD = (245, 210, 90)
 
 SCORES_FILE = "scores.json"
 WORDS_FILE = "words.txt"
+
+# Characters accepted in leaderboard names: one O(1) set probe per
+# keystroke, and keeps scores.json to plain ASCII.
+ALLOWED_NAME_CHARS = frozenset(string.ascii_letters + string.digits + " -_.")
+
+# Single RNG instance; avoids the module-level lookups random.choice/shuffle
+# pay on every call.
+_rng = random.Random()
+
+# Fonts are created once at import (pygame.init() above makes that safe)
+# instead of per round, which re-parsed the default font each time.
+FONT = pygame.font.Font(None, FONT_SIZE)
+SMALL_FONT = pygame.font.Font(None, FONT_SIZE - 6)
+BIG_FONT = pygame.font.Font(None, 56)
+TIMER_FONT = pygame.font.Font(None, 40)
+GAME_OVER_FONT = pygame.font.Font(None, 64)
 # -------------------------------------------
 
 # ---------------- Utilities ----------------
+@functools.lru_cache(maxsize=1)
 def load_words():
+    # Cached so "new game" restarts reuse the parsed dictionary instead of
+    # re-reading words.txt. A frozenset makes the per-submit
+    # "guess in valid_words" check O(1); nothing relies on dictionary order.
     if not os.path.exists(WORDS_FILE):
         raise FileNotFoundError(f"{WORDS_FILE} not found.")
     with open(WORDS_FILE, encoding="utf-8") as f:
-        return sorted({w.strip().lower() for w in f if w.strip()})
+        lines = f.read().splitlines()
+    return frozenset(w.strip().lower() for w in lines if w.strip())
 
 def load_scores():
     if not os.path.exists(SCORES_FILE):
@@ -52,80 +81,167 @@ def load_scores():
 def save_score(name, score):
     scores = load_scores()
     scores.append({"name": name, "score": score})
-    scores = sorted(scores, key=lambda s: s["score"], reverse=True)[:20]
-    with open(SCORES_FILE, "w", encoding="utf-8") as f:
+    scores = heapq.nlargest(20, scores, key=lambda s: s["score"])
+    # Write-then-rename so an exit mid-write can never corrupt the file.
+    tmp_path = SCORES_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(scores, f, indent=4)
+    os.replace(tmp_path, SCORES_FILE)
 # -------------------------------------------
 
 # ---------------- Game Helpers --------------
 def generate_letters(word):
     letters = list(word)
-    random.shuffle(letters)
+    _rng.shuffle(letters)
     return letters
 
-def get_possible_words(letters, valid_words, main_word):
-    possible_words = set()
-    for i in range(3, len(letters) + 1):
-        for perm in permutations(letters, i):
-            candidate = ''.join(perm)
-            if candidate in valid_words:
-                possible_words.add(candidate)
-    possible_words.add(main_word)
-    return sorted(possible_words, key=lambda w: (len(w), w))
+# The anagram index maps a sorted-letter signature to every word spelled
+# with exactly those letters. Built once per dictionary; after that a rack
+# is solved with ~100 dict lookups instead of scanning 61k words.
+_anagram_index_cache = {}
+
+def anagram_index(valid_words):
+    index = _anagram_index_cache.get(id(valid_words))
+    if index is None:
+        index = {}
+        for word in valid_words:
+            if len(word) >= 3:
+                index.setdefault("".join(sorted(word)), []).append(word)
+        _anagram_index_cache[id(valid_words)] = index
+    return index
+
+# Words bucketed by length, so picking a round's word touches only the
+# candidates of the right size instead of scanning the whole dictionary.
+_length_bucket_cache = {}
+
+def words_by_length(valid_words):
+    buckets = _length_bucket_cache.get(id(valid_words))
+    if buckets is None:
+        buckets = {}
+        for word in valid_words:
+            buckets.setdefault(len(word), []).append(word)
+        for length, words in buckets.items():
+            buckets[length] = tuple(words)
+        _length_bucket_cache[id(valid_words)] = buckets
+    return buckets
+
+# Results are memoized per sorted rack, so restarting onto a previously
+# seen set of letters skips the combination enumeration entirely.
+_rack_cache = {}
+
+def get_possible_words(letters, valid_words):
+    """Playable words for this rack, bucketed by length: {length: (words...)}."""
+    rack_key = "".join(sorted(letters))
+    cached = _rack_cache.get(rack_key)
+    if cached is None:
+        index = anagram_index(valid_words)
+        by_len = {}
+        # Combinations of size k can only match k-letter words, so each pass
+        # fills exactly one bucket and no global (len, word) sort is needed.
+        for size in range(3, len(rack_key) + 1):
+            bucket = set()
+            for combo in combinations(rack_key, size):
+                bucket.update(index.get("".join(combo), ()))
+            if bucket:
+                by_len[size] = tuple(sorted(bucket))
+        cached = by_len
+        _rack_cache[rack_key] = cached
+    return cached
 # -------------------------------------------
 
 # ---------------- UI Classes ----------------
+# Rendering text and rounded rects is the expensive part of a pygame frame,
+# so glyphs, box faces and button faces are rasterized once and blitted
+# from these caches afterwards.
+@functools.lru_cache(maxsize=1024)
+def glyph_surface(font, text, color):
+    # The LRU bound keeps ever-changing strings (timer, score, guesses) from
+    # growing the cache without limit across a long session. convert_alpha()
+    # puts the glyph in the display pixel format so every later blit takes
+    # the fast path instead of converting per frame.
+    return font.render(text, True, color).convert_alpha()
+
+_box_face_cache = {}
+
+def box_face_surface(size, border_color=DARK_GRAY):
+    key = (size, border_color)
+    surf = _box_face_cache.get(key)
+    if surf is None:
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.rect(surf, WHITE, surf.get_rect(), border_radius=6)
+        pygame.draw.rect(surf, border_color, surf.get_rect(), 2, border_radius=6)
+        surf = surf.convert_alpha()
+        _box_face_cache[key] = surf
+    return surf
+
 class Button:
     def __init__(self, x, y, width, height, text, color, hover_color, text_color=BLACK):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
+        self.lower_text = text.lower()
         self.color = color
         self.hover_color = hover_color
         self.text_color = text_color
         self.is_hovered = False
         self.is_selected = False
+        self._face_cache = {}
+
+    def _face(self, font, radius):
+        state = "selected" if self.is_selected else ("hover" if self.is_hovered else "normal")
+        key = (state, radius, id(font))
+        surf = self._face_cache.get(key)
+        if surf is None:
+            color = DIM_BLUE if self.is_selected else (self.hover_color if self.is_hovered else self.color)
+            surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, surf.get_rect(), border_radius=radius)
+            pygame.draw.rect(surf, DARK_GRAY, surf.get_rect(), 2, border_radius=radius)
+            text_surface = glyph_surface(font, self.text, self.text_color)
+            surf.blit(text_surface, text_surface.get_rect(center=surf.get_rect().center))
+            surf = surf.convert_alpha()
+            self._face_cache[key] = surf
+        return surf
 
     def draw(self, surface, font, radius=10):
-        color = DIM_BLUE if self.is_selected else (self.hover_color if self.is_hovered else self.color)
-        pygame.draw.rect(surface, color, self.rect, border_radius=radius)
-        pygame.draw.rect(surface, DARK_GRAY, self.rect, 2, border_radius=radius)
-        text_surface = font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        surface.blit(text_surface, text_rect)
+        surface.blit(self._face(font, radius), self.rect)
 
     def check_hover(self, pos):
         self.is_hovered = self.rect.collidepoint(pos)
         return self.is_hovered
 
     def is_clicked(self, pos, event):
-        return event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.rect.collidepoint(pos)
-
-class LetterBox:
-    def __init__(self, x, y, size):
-        self.rect = pygame.Rect(x, y, size, size)
-        self.letter = ""
-
-    def draw(self, surface, font):
-        pygame.draw.rect(surface, WHITE, self.rect, border_radius=6)
-        pygame.draw.rect(surface, DARK_GRAY, self.rect, 2, border_radius=6)
-        if self.letter:
-            text_surface = font.render(self.letter.upper(), True, BLACK)
-            text_rect = text_surface.get_rect(center=self.rect.center)
-            surface.blit(text_surface, text_rect)
+        # event.pos is exact for the click even if hover polling is throttled.
+        return event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.rect.collidepoint(event.pos)
 
 class WordGroup:
+    # Boxes are stored struct-of-arrays style: one list of x positions plus
+    # the word string and a fill count, instead of an object per letter.
     def __init__(self, word, x, y):
         self.word = word
-        self.boxes = [LetterBox(x + i * (LETTER_BOX_SIZE + 6), y, LETTER_BOX_SIZE) for i in range(len(word))]
+        self.y = y
+        self.xs = [x + i * (LETTER_BOX_SIZE + 6) for i in range(len(word))]
+        self.filled = 0
         self.revealed = False
 
-    def draw(self, surface, font):
-        for box in self.boxes:
-            box.draw(surface, font)
+    def box_rect(self, i, dx=0):
+        return pygame.Rect(self.xs[i] + dx, self.y, LETTER_BOX_SIZE, LETTER_BOX_SIZE)
+
+    def draw(self, surface, font, dx=0):
+        for surf, dest in self.iter_blits(font, dx):
+            surface.blit(surf, dest)
+
+    def iter_blits(self, font, dx=0):
+        # Yields (surface, rect) pairs so callers can batch whole groups
+        # into a single Surface.blits() call.
+        face = box_face_surface(LETTER_BOX_SIZE)
+        for i in range(len(self.word)):
+            rect = self.box_rect(i, dx)
+            yield face, rect
+            if i < self.filled:
+                glyph = glyph_surface(font, self.word[i].upper(), BLACK)
+                yield glyph, glyph.get_rect(center=rect.center)
 
     def fill_word(self):
-        for i, ch in enumerate(self.word):
-            self.boxes[i].letter = ch
+        self.filled = len(self.word)
 # -------------------------------------------
 
 # ---------------- Difficulty Menu -----------
@@ -169,10 +285,17 @@ def difficulty_menu(screen, clock, fonts):
         screen.blit(footer, footer.get_rect(center=(WIDTH//2, HEIGHT - 80)))
 
         pygame.display.flip()
-        for event in pygame.event.get():
+        # The menu only changes in response to input, so sleep inside SDL
+        # until an event arrives (or a frame period passes) instead of
+        # spinning the loop at full rate.
+        first = pygame.event.wait(1000 // FPS)
+        events = pygame.event.get()
+        if first.type != pygame.NOEVENT:
+            events.insert(0, first)
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                # Signal run() to shut the app down.
+                return None
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_LEFT:
                     selected = max(0, selected-1)
@@ -199,24 +322,20 @@ def difficulty_menu(screen, clock, fonts):
 # -------------------------------------------
 
 # ---------------- Main Game ----------------
-def main_game(word_length):
-    font = pygame.font.Font(None, FONT_SIZE)
-    small_font = pygame.font.Font(None, FONT_SIZE - 6)
-    big_font = pygame.font.Font(None, 56)
-
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Text Twist")
-    clock = pygame.time.Clock()
+def main_game(screen, clock, fonts, word_length):
+    # The window, clock and fonts are created once in run() and shared with
+    # the menu; a new round only rebuilds per-round state.
+    font, small_font, big_font = fonts
 
     valid_words = load_words()
-    candidates = [w for w in valid_words if len(w) == word_length]
+    by_length = words_by_length(valid_words)
+    candidates = by_length.get(word_length) or by_length.get(6)
     if not candidates:
-        candidates = [w for w in valid_words if len(w) == 6]
-        if not candidates:
-            raise RuntimeError("No suitable words found.")
-    random_word = random.choice(candidates)
+        raise RuntimeError("No suitable words found.")
+    random_word = _rng.choice(candidates)
     letters = generate_letters(random_word)
-    possible_words = get_possible_words(letters, valid_words, random_word)
+    words_by_len = get_possible_words(letters, valid_words)
+    possible_set = frozenset(w for ws in words_by_len.values() for w in ws)  # O(1) lookups
 
     left_panel_w = min(760, WIDTH - 420)
     right_panel_x = left_panel_w + 40
@@ -227,10 +346,14 @@ def main_game(word_length):
     message = ""
     message_timer = 0
     message_color = BLACK
+    # (char, button) pairs: keeping the originating button makes deselecting
+    # one of two identical rack letters unambiguous and O(1) to resolve.
+    # guess_str mirrors the pair list so the hot paths never re-join it.
     current_guess = []
+    guess_str = ""
 
-    timer_seconds = max(10, len(possible_words) * 9)
-    timer_font = pygame.font.Font(None, 40)
+    timer_seconds = max(10, len(possible_set) * 9)
+    timer_font = TIMER_FONT
     time_bonus_per_letter = 2
     game_over = False
 
@@ -247,6 +370,11 @@ def main_game(word_length):
         y = letters_y
         letter_buttons.append(Button(x, y, BUTTON_SIZE, BUTTON_SIZE, letter.upper(), LIGHT_BLUE, BLUE, WHITE))
 
+    # Index buttons by letter so keystrokes don't scan the whole rack.
+    buttons_by_char = {}
+    for button in letter_buttons:
+        buttons_by_char.setdefault(button.lower_text, []).append(button)
+
     act_w = 140
     gap = 20
     actions_total = 3 * act_w + 2*gap
@@ -256,354 +384,346 @@ def main_game(word_length):
     shuffle_button = Button(left_x + 2*(act_w + gap), HEIGHT - bottom_margin - button_height, act_w, button_height, "SHUFFLE", YELLOW, (230, 200, 50), BLACK)
     new_game_button = Button(WIDTH - 180, 28, 140, 42, "NEW GAME", GRAY, DARK_GRAY, BLACK)
 
-    grouped = {}
-    for word in possible_words:
-        grouped.setdefault(len(word), []).append(word)
-    for length, words in list(grouped.items()):
-        grouped[length] = {"header": f"{length}-Letter Words", "words": words}
-
-    visible_required_words = []
-    for length in sorted(grouped.keys()):
-        visible_required_words.extend(grouped[length]["words"])
+    grouped = {length: {"header": f"{length}-Letter Words", "words": list(words)}
+               for length, words in words_by_len.items()}
+
+    # Completion is tracked with a countdown instead of re-scanning every
+    # visible word each frame: submit_guess decrements it per new find.
+    remaining_required = len(possible_set)
+
+    # The word-panel layout is fixed for the round, so positions are computed
+    # once and the WordGroups allocated here instead of inside the draw loop.
+    left_rect = pygame.Rect(20, 120, left_panel_w, HEIGHT - 180)
+    content_x = left_rect.x + 12
+    content_y = left_rect.y + 52
+    content_w = left_rect.width - 24
+    content_h = left_rect.height - 56
+    row_height = LETTER_BOX_SIZE + 10
+    max_rows = max(1, content_h // row_height)
+
+    lengths_sorted = sorted(grouped.keys())
+    word_groups = {}
+    x_cursor = content_x
+    for length in lengths_sorted:
+        info = grouped[length]
+        max_word_len = max((len(w) for w in info["words"]), default=1)
+        col_width = max_word_len * (LETTER_BOX_SIZE + 6) + 40
+        row = 0
+        subcol = 0
+        for word in info["words"]:
+            word_x = x_cursor + subcol * col_width
+            word_y = content_y + row * row_height
+            word_groups[word] = WordGroup(word, word_x, word_y)
+            row += 1
+            if row >= max_rows:
+                row = 0
+                subcol += 1
+        info["x"] = x_cursor
+        info["col_width"] = col_width
+        info["header_surf"] = small_font.render(info["header"], True, DARK_GRAY)
+        info["header_rect"] = info["header_surf"].get_rect(center=(x_cursor + col_width // 2, content_y - 16))
+        x_cursor += col_width * (subcol + 1)
+    max_scroll = max(0, x_cursor - content_x - content_w + 40)
+
+    # Static chrome never changes during a round, so it is rendered once to a
+    # background surface and restored with a single blit per frame.
+    top_bar = pygame.Rect(20, 16, WIDTH - 40, 88)
+    guess_card = pygame.Rect(right_panel_x, 140, WIDTH - right_panel_x - 40, 160)
+    capsule = pygame.Rect(guess_card.x + 18, guess_card.y + 46, guess_card.width - 36, 72)
+    background = pygame.Surface((WIDTH, HEIGHT))
+    background.fill(PANEL_BG)
+    pygame.draw.rect(background, WHITE, top_bar, border_radius=14)
+    pygame.draw.rect(background, DARK_GRAY, top_bar, 2, border_radius=14)
+    title = big_font.render("TEXT TWIST", True, BLUE)
+    background.blit(title, (40, 30))
+    pygame.draw.rect(background, WHITE, left_rect, border_radius=12)
+    pygame.draw.rect(background, DARK_GRAY, left_rect, 2, border_radius=12)
+    panel_title = small_font.render("Words", True, DARK_GRAY)
+    background.blit(panel_title, (left_rect.x + 16, left_rect.y + 16))  # shifted down
+    pygame.draw.rect(background, WHITE, guess_card, border_radius=12)
+    pygame.draw.rect(background, DARK_GRAY, guess_card, 2, border_radius=12)
+    guess_label = small_font.render("Your Guess", True, DARK_GRAY)
+    background.blit(guess_label, (guess_card.x + 18, guess_card.y + 12))
+    pygame.draw.rect(background, PANEL_BG, capsule, border_radius=36)
+    pygame.draw.rect(background, (200,200,200), capsule, 2, border_radius=36)
+    background = background.convert()
+
+    # The unfound grid state never changes either: headers and empty boxes
+    # are stamped once onto a grid surface. Each frame blits the visible
+    # slice of it and overlays only the words that have been found.
+    grid_top = content_y - 32
+    grid_h = content_h + 32
+    grid_surf = pygame.Surface((max(content_w, x_cursor - content_x), grid_h), pygame.SRCALPHA)
+    for length in lengths_sorted:
+        info = grouped[length]
+        grid_surf.blit(info["header_surf"], info["header_rect"].move(-content_x, -grid_top))
+        for word in info["words"]:
+            for surf, rect in word_groups[word].iter_blits(font, -content_x):
+                grid_surf.blit(surf, rect.move(0, -grid_top))
+    grid_surf = grid_surf.convert_alpha()
+    panel_clip = pygame.Rect(content_x, grid_top, content_w, grid_h)
 
     scroll_offset = 0
     scroll_speed = 40
     floating_texts = []
     reveal_animations = {}
-    last_tick = pygame.time.get_ticks()
+    # (Re)arm the 1 Hz countdown so the round starts with a full second;
+    # SDL posts TIMER_EVENT on schedule no matter what the frame rate does.
+    pygame.time.set_timer(TIMER_EVENT, 1000)
+    mouse_pos = pygame.mouse.get_pos()
+    mouse_moved = True  # force one hover pass on the first frame
+    guess_shown = None  # forces the guess surface/rect to build on frame one
+
+    def clear_guess():
+        nonlocal current_guess, guess_str
+        current_guess = []
+        guess_str = ""
+        for b in letter_buttons:
+            b.is_selected = False
+
+    # Guess validation is shared by the RETURN key and the SUBMIT button,
+    # so the scoring rules live in exactly one place.
+    def submit_guess():
+        nonlocal message, message_color, message_timer, score, timer_seconds
+        nonlocal remaining_required
+        guess = guess_str
+        if not guess:
+            message = "No input!"
+            message_color = RED
+            message_timer = 60
+        elif guess in found_words or guess in bonus_found:
+            message = "Already found!"
+            message_color = DARK_GRAY
+            message_timer = 60
+        elif guess in valid_words and guess not in possible_set:
+            # Bonus dictionary word not on the board; accept once
+            bonus_found.add(guess)
+            pts = len(guess) * 5
+            secs = len(guess)
+            score += pts
+            timer_seconds += secs
+            message = f"Bonus! +{pts} pts +{secs}s"
+            message_color = BLUE
+            message_timer = 90
+            floating_texts.append({
+                "text": f"+{pts}",
+                "x": right_panel_x + 160,
+                "y": 220,
+                "color": BLUE,
+                "vx": 0,
+                "vy": -1.2,
+                "life": 60,
+                "max_life": 60
+            })
+        elif guess in possible_set:
+            found_words.add(guess)
+            remaining_required -= 1
+            pts = len(guess) * 10
+            secs = len(guess) * time_bonus_per_letter
+            score += pts
+            timer_seconds += secs
+            message = f"Good! +{pts} pts +{secs}s"
+            message_color = GREEN
+            message_timer = 90
+            floating_texts.append({
+                "text": f"+{pts}",
+                "x": right_panel_x + 80,
+                "y": 220,
+                "color": GREEN,
+                "vx": 0,
+                "vy": -1.4,
+                "life": 60,
+                "max_life": 60
+            })
+            reveal_animations[guess] = {"tick": 0, "max_tick": 12 + len(guess)*4}
+        else:
+            message = "Invalid!"
+            message_color = RED
+            message_timer = 60
+        clear_guess()
 
     running = True
     while running:
-        now = pygame.time.get_ticks()
-        elapsed = now - last_tick
-        if elapsed >= 1000:
-            dec = elapsed // 1000
-            if not game_over:
-                timer_seconds -= dec
-                if timer_seconds <= 0:
-                    timer_seconds = 0
-                    game_over = True
-            last_tick += dec * 1000
+        # Hover states only change when the cursor moves, so skip the
+        # per-frame collidepoint sweep while the mouse is parked.
+        if mouse_moved:
+            mouse_pos = pygame.mouse.get_pos()
+            new_game_button.check_hover(mouse_pos)
+            for button in letter_buttons:
+                button.check_hover(mouse_pos)
+            for btn in (submit_button, clear_button, shuffle_button):
+                btn.check_hover(mouse_pos)
+            mouse_moved = False
 
-        mouse_pos = pygame.mouse.get_pos()
-        screen.fill(PANEL_BG)
+        screen.blit(background, (0, 0))
 
-        # --- Top bar ---
-        top_bar = pygame.Rect(20, 16, WIDTH - 40, 88)
-        pygame.draw.rect(screen, WHITE, top_bar, border_radius=14)
-        pygame.draw.rect(screen, DARK_GRAY, top_bar, 2, border_radius=14)
-        title = big_font.render("TEXT TWIST", True, BLUE)
-        screen.blit(title, (40, 30))
+        # --- Top bar (dynamic parts only) ---
         timer_color = RED if timer_seconds <= 10 else BLACK
-        timer_text = timer_font.render(f"Time: {timer_seconds}", True, timer_color)
-        score_text = font.render(f"Score: {score}", True, BLACK)
+        timer_text = glyph_surface(timer_font, f"Time: {timer_seconds}", timer_color)
+        score_text = glyph_surface(font, f"Score: {score}", BLACK)
         screen.blit(timer_text, (WIDTH - 300, 24))
         screen.blit(score_text, (WIDTH - 300, 56))
-        new_game_button.check_hover(mouse_pos)
         new_game_button.draw(screen, font, radius=12)
 
         # --- Left panel ---
-        left_rect = pygame.Rect(20, 120, left_panel_w, HEIGHT - 180)
-        pygame.draw.rect(screen, WHITE, left_rect, border_radius=12)
-        pygame.draw.rect(screen, DARK_GRAY, left_rect, 2, border_radius=12)
-        panel_title = small_font.render("Words", True, DARK_GRAY)
-        screen.blit(panel_title, (left_rect.x + 16, left_rect.y + 16))  # shifted down
-
-        content_x = left_rect.x + 12
-        content_y = left_rect.y + 52
-        content_w = left_rect.width - 24
-        content_h = left_rect.height - 56
-
-        row_height = LETTER_BOX_SIZE + 10
-        max_rows = max(1, content_h // row_height)
-        lengths_sorted = sorted(grouped.keys())
-        col_widths = []
-        for l in lengths_sorted:
-            words = grouped[l]["words"]
-            max_word_len = max((len(w) for w in words), default=1)
-            col_widths.append(max_word_len * (LETTER_BOX_SIZE + 6) + 40)
-
-        x_cursor = content_x - scroll_offset
-        max_right = 0
-        for idx, l in enumerate(lengths_sorted):
-            words_info = grouped[l]
-            header_text = small_font.render(words_info["header"], True, DARK_GRAY)
-            header_rect = header_text.get_rect(center=(x_cursor + col_widths[idx] // 2, content_y - 16))
-            screen.blit(header_text, header_rect)
-
-            row = 0
-            subcol = 0
-            for word in words_info["words"]:
-                word_x = x_cursor + subcol * col_widths[idx]
-                word_y = content_y + row * row_height
-                wg = WordGroup(word, word_x, word_y)
-                # reveal logic
-                if word in found_words or word in bonus_found:
-                    anim = reveal_animations.get(word)
-                    if not anim:
-                        reveal_animations[word] = {"tick": 0, "max_tick": 12 + len(word)*4}
-                        anim = reveal_animations[word]
-                    prog = anim["tick"]/anim["max_tick"]
-                    reveal_count = int(prog * len(word))
-                    for i, box in enumerate(wg.boxes):
-                        pygame.draw.rect(screen, WHITE, box.rect, border_radius=6)
-                        border_color = GOLD if (anim["tick"] < anim["max_tick"] and (anim["tick"]//3)%2 == 0) else DARK_GRAY
-                        pygame.draw.rect(screen, border_color, box.rect, 2, border_radius=6)
-                        if i < reveal_count:
-                            txt = font.render(word[i].upper(), True, BLACK)
-                            screen.blit(txt, txt.get_rect(center=box.rect.center))
-                    anim["tick"] += 1
-                    if anim["tick"] > anim["max_tick"]:
-                        for i, ch in enumerate(word):
-                            wg.boxes[i].letter = ch
-                else:
-                    wg.draw(screen, font)
-
-                row += 1
-                if row >= max_rows:
-                    row = 0
-                    subcol += 1
-            total_subcols = subcol + 1
-            x_cursor += col_widths[idx] * total_subcols
-            max_right = max(max_right, x_cursor)
-
-        scroll_offset = max(0, min(scroll_offset, max(0, max_right - content_x - content_w + 40)))
-        # Right panel: guess area
-        guess_card = pygame.Rect(right_panel_x, 140, WIDTH - right_panel_x - 40, 160)
-        pygame.draw.rect(screen, WHITE, guess_card, border_radius=12)
-        pygame.draw.rect(screen, DARK_GRAY, guess_card, 2, border_radius=12)
-        guess_label = small_font.render("Your Guess", True, DARK_GRAY)
-        screen.blit(guess_label, (guess_card.x + 18, guess_card.y + 12))
-
-        # Capsule for typed letters
-        capsule = pygame.Rect(guess_card.x + 18, guess_card.y + 46, guess_card.width - 36, 72)
-        pygame.draw.rect(screen, PANEL_BG, capsule, border_radius=36)
-        pygame.draw.rect(screen, (200,200,200), capsule, 2, border_radius=36)
-        guess_text = big_font.render("".join(current_guess).upper(), True, BLACK)
-        screen.blit(guess_text, guess_text.get_rect(center=capsule.center))
+        scroll_offset = max(0, min(scroll_offset, max_scroll))
+        dx = -scroll_offset
+        screen.blit(grid_surf, (content_x, grid_top),
+                    area=pygame.Rect(scroll_offset, 0, content_w, grid_h))
+
+        # Overlay only the words still animating their reveal; once an
+        # animation finishes, the word is stamped into grid_surf and costs
+        # nothing on later frames.
+        panel_blits = []
+        for word, anim in list(reveal_animations.items()):
+            wg = word_groups[word]
+            prog = anim["tick"]/anim["max_tick"]
+            reveal_count = int(prog * len(word))
+            border_color = GOLD if (anim["tick"]//3)%2 == 0 else DARK_GRAY
+            for i in range(len(word)):
+                rect = wg.box_rect(i, dx)
+                panel_blits.append((box_face_surface(rect.width, border_color), rect))
+                if i < reveal_count:
+                    txt = glyph_surface(font, word[i].upper(), BLACK)
+                    panel_blits.append((txt, txt.get_rect(center=rect.center)))
+            anim["tick"] += 1
+            if anim["tick"] > anim["max_tick"]:
+                wg.fill_word()
+                for surf, rect in wg.iter_blits(font, -content_x):
+                    grid_surf.blit(surf, rect.move(0, -grid_top))
+                del reveal_animations[word]
+        prev_clip = screen.get_clip()
+        screen.set_clip(panel_clip)
+        screen.blits(panel_blits, doreturn=False)
+        screen.set_clip(prev_clip)
+        # Right panel: typed letters inside the capsule
+        if guess_str != guess_shown:
+            guess_surf = glyph_surface(big_font, guess_str.upper(), BLACK)
+            guess_rect = guess_surf.get_rect(center=capsule.center)
+            guess_shown = guess_str
+        screen.blit(guess_surf, guess_rect)
 
         # Draw letter buttons (bottom)
         for button in letter_buttons:
-            button.check_hover(mouse_pos)
             button.draw(screen, font, radius=10)
 
         # Draw action buttons (bottom center)
         for btn in (submit_button, clear_button, shuffle_button):
-            btn.check_hover(mouse_pos)
             btn.draw(screen, font, radius=12)
 
         # Messages
         if message and message_timer > 0:
-            msg_surf = font.render(message, True, message_color)
+            msg_surf = glyph_surface(font, message, message_color)
             screen.blit(msg_surf, (right_panel_x + 20, guess_card.y + guess_card.height + 10))
             message_timer -= 1
 
         # Floating animations
-        for ft in floating_texts[:]:
-            surf = font.render(ft["text"], True, ft["color"])
+        # Expired popups are compacted out with a write index: no slice copy
+        # per frame and no O(n) remove() calls mid-iteration.
+        alive = 0
+        for ft in floating_texts:
+            # Cached surface; the fade alpha is (re)set right before each
+            # blit, so sharing one surface per text is safe.
+            surf = glyph_surface(font, ft["text"], ft["color"])
             surf.set_alpha(max(0, int(255 * (ft["life"] / ft["max_life"]))))
             screen.blit(surf, (ft["x"], ft["y"]))
             ft["x"] += ft.get("vx", 0)
             ft["y"] += ft.get("vy", -1)
             ft["life"] -= 1
-            if ft["life"] <= 0:
-                floating_texts.remove(ft)
+            if ft["life"] > 0:
+                floating_texts[alive] = ft
+                alive += 1
+        del floating_texts[alive:]
 
         # Event handling
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            if event.type == pygame.MOUSEMOTION:
+                mouse_moved = True
+
+            if event.type == TIMER_EVENT and not game_over:
+                timer_seconds -= 1
+                if timer_seconds <= 0:
+                    timer_seconds = 0
+                    game_over = True
+
             # Mouse wheel scroll left panel content
             if event.type == pygame.MOUSEWHEEL:
                 scroll_offset -= event.y * scroll_speed
-                scroll_offset = max(0, min(scroll_offset, max(0, max_right - content_x - content_w + 40)))
+                scroll_offset = max(0, min(scroll_offset, max_scroll))
 
             # Keyboard input (only select first unused matching letter button)
             if event.type == pygame.KEYDOWN:
                 key = event.unicode.lower()
                 if key.isalpha() and len(key) == 1:
-                    for button in letter_buttons:
-                        if button.text.lower() == key and not button.is_selected:
+                    for button in buttons_by_char.get(key, ()):
+                        if not button.is_selected:
                             button.is_selected = True
-                            current_guess.append(button.text.lower())
+                            current_guess.append((key, button))
+                            guess_str += key
                             break
 
                 elif event.key == pygame.K_RETURN:
-                    guess = "".join(current_guess).lower().strip()
-                    if not guess:
-                        message = "No input!"
-                        message_color = RED
-                        message_timer = 60
-                    else:
-                        # Already found visible word
-                        if guess in found_words:
-                            message = "Already found!"
-                            message_color = DARK_GRAY
-                            message_timer = 60
-                        # Already claimed as bonus
-                        elif guess in bonus_found:
-                            message = "Already found!"
-                            message_color = DARK_GRAY
-                            message_timer = 60
-                        # Bonus dictionary word (not in possible_words)
-                        elif guess in valid_words and guess not in possible_words:
-                            # accept once
-                            bonus_found.add(guess)
-                            pts = len(guess) * 5
-                            score += pts
-                            timer_seconds += len(guess)
-                            message = f"Bonus! +{pts} pts +{len(guess)}s"
-                            message_color = BLUE
-                            message_timer = 90
-                            floating_texts.append({
-                                "text": f"+{pts}",
-                                "x": right_panel_x + 160,
-                                "y": 220,
-                                "color": BLUE,
-                                "vx": 0,
-                                "vy": -1.2,
-                                "life": 60,
-                                "max_life": 60
-                            })
-                            reveal_animations[guess] = {"tick": 0, "max_tick": 12 + len(guess)*4}
-                        # Normal visible-word scoring
-                        elif guess in possible_words and guess not in found_words:
-                            found_words.add(guess)
-                            pts = len(guess) * 10
-                            score += pts
-                            timer_seconds += len(guess) * time_bonus_per_letter
-                            message = f"Good! +{pts} pts +{len(guess)*time_bonus_per_letter}s"
-                            message_color = GREEN
-                            message_timer = 90
-                            floating_texts.append({
-                                "text": f"+{pts}",
-                                "x": right_panel_x + 80,
-                                "y": 220,
-                                "color": GREEN,
-                                "vx": 0,
-                                "vy": -1.4,
-                                "life": 60,
-                                "max_life": 60
-                            })
-                            reveal_animations[guess] = {"tick": 0, "max_tick": 12 + len(guess)*4}
-                        else:
-                            message = "Invalid!"
-                            message_color = RED
-                            message_timer = 60
-
-                    # reset selection and current_guess
-                    current_guess = []
-                    for b in letter_buttons:
-                        b.is_selected = False
+                    submit_guess()
 
                 elif event.key == pygame.K_BACKSPACE:
-                    current_guess = []
-                    for b in letter_buttons:
-                        b.is_selected = False
+                    clear_guess()
 
                 elif event.key == pygame.K_SPACE:
-                    random.shuffle(letter_buttons)
+                    _rng.shuffle(letter_buttons)
                     total_width_local = len(letter_buttons) * (BUTTON_SIZE + BUTTON_MARGIN) - BUTTON_MARGIN
                     start_x_local = max(right_panel_x + (WIDTH - right_panel_x - total_width_local)//2, (WIDTH - total_width_local)//2)
                     for i, button in enumerate(letter_buttons):
                         button.rect.x = start_x_local + i * (BUTTON_SIZE + BUTTON_MARGIN)
+                    mouse_moved = True  # rects moved under the cursor
 
                 elif event.key == pygame.K_ESCAPE:
                     # Return to difficulty menu by exiting this function
-                    return
+                    return True
 
-            # Mouse interactions with letter buttons
-            for button in letter_buttons:
-                if button.is_clicked(mouse_pos, event):
-                    if not button.is_selected:
-                        button.is_selected = True
-                        current_guess.append(button.text.lower())
-                    else:
-                        # deselect (remove first occurrence)
-                        button.is_selected = False
-                        if button.text.lower() in current_guess:
-                            current_guess.remove(button.text.lower())
-
-            # Submit button
-            if submit_button.is_clicked(mouse_pos, event):
-                guess = "".join(current_guess).lower().strip()
-                if not guess:
-                    message = "No input!"
-                    message_color = RED
-                    message_timer = 60
-                else:
-                    if guess in found_words or guess in bonus_found:
-                        message = "Already found!"
-                        message_color = DARK_GRAY
-                        message_timer = 60
-                    elif guess in valid_words and guess not in possible_words:
-                        bonus_found.add(guess)
-                        pts = len(guess) * 5
-                        score += pts
-                        timer_seconds += len(guess)
-                        message = f"Bonus! +{pts} pts +{len(guess)}s"
-                        message_color = BLUE
-                        message_timer = 90
-                        floating_texts.append({
-                            "text": f"+{pts}",
-                            "x": right_panel_x + 160,
-                            "y": 220,
-                            "color": BLUE,
-                            "vx": 0,
-                            "vy": -1.2,
-                            "life": 60,
-                            "max_life": 60
-                        })
-                        reveal_animations[guess] = {"tick": 0, "max_tick": 12 + len(guess)*4}
-                    elif guess in possible_words and guess not in found_words:
-                        found_words.add(guess)
-                        pts = len(guess) * 10
-                        score += pts
-                        timer_seconds += len(guess) * time_bonus_per_letter
-                        message = f"Good! +{pts} pts +{len(guess)*time_bonus_per_letter}s"
-                        message_color = GREEN
-                        message_timer = 90
-                        floating_texts.append({
-                            "text": f"+{pts}",
-                            "x": right_panel_x + 80,
-                            "y": 220,
-                            "color": GREEN,
-                            "vx": 0,
-                            "vy": -1.4,
-                            "life": 60,
-                            "max_life": 60
-                        })
-                        reveal_animations[guess] = {"tick": 0, "max_tick": 12 + len(guess)*4}
-                    else:
-                        message = "Invalid!"
-                        message_color = RED
-                        message_timer = 60
-
-                current_guess = []
-                for b in letter_buttons:
-                    b.is_selected = False
-
-            # Clear
-            if clear_button.is_clicked(mouse_pos, event):
-                current_guess = []
-                for b in letter_buttons:
-                    b.is_selected = False
-
-            # Shuffle
-            if shuffle_button.is_clicked(mouse_pos, event):
-                random.shuffle(letter_buttons)
-                total_width_local = len(letter_buttons) * (BUTTON_SIZE + BUTTON_MARGIN) - BUTTON_MARGIN
-                start_x_local = max(right_panel_x + (WIDTH - right_panel_x - total_width_local)//2, (WIDTH - total_width_local)//2)
-                for i, button in enumerate(letter_buttons):
-                    button.rect.x = start_x_local + i * (BUTTON_SIZE + BUTTON_MARGIN)
-
-            # New game
-            if new_game_button.is_clicked(mouse_pos, event):
-                return
+            # Mouse interactions: test the event type once, then route the
+            # click by position.
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                pos = event.pos
+                # Letter buttons
+                for button in letter_buttons:
+                    if button.rect.collidepoint(pos):
+                        if not button.is_selected:
+                            button.is_selected = True
+                            current_guess.append((button.lower_text, button))
+                            guess_str += button.lower_text
+                        else:
+                            # deselect exactly this button's letter
+                            button.is_selected = False
+                            current_guess = [p for p in current_guess if p[1] is not button]
+                            guess_str = "".join(c for c, _ in current_guess)
+                        break
+
+                # Submit button
+                if submit_button.rect.collidepoint(pos):
+                    submit_guess()
+
+                # Clear
+                elif clear_button.rect.collidepoint(pos):
+                    clear_guess()
+
+                # Shuffle
+                elif shuffle_button.rect.collidepoint(pos):
+                    _rng.shuffle(letter_buttons)
+                    total_width_local = len(letter_buttons) * (BUTTON_SIZE + BUTTON_MARGIN) - BUTTON_MARGIN
+                    start_x_local = max(right_panel_x + (WIDTH - right_panel_x - total_width_local)//2, (WIDTH - total_width_local)//2)
+                    for i, button in enumerate(letter_buttons):
+                        button.rect.x = start_x_local + i * (BUTTON_SIZE + BUTTON_MARGIN)
+                    mouse_moved = True  # rects moved under the cursor
+
+                # New game
+                elif new_game_button.rect.collidepoint(pos):
+                    return True
 
         # After event processing, check for completion: all visible words found
-        if all(w in found_words for w in visible_required_words):
+        if remaining_required == 0 and not game_over:
             # award completion bonus and end game
             message = "All words found! +100 bonus"
             message_color = GOLD
@@ -614,70 +734,107 @@ def main_game(word_length):
         # If timer expired, go to Game Over name entry
         if game_over or timer_seconds <= 0:
             name = ""
+            name_shown = None  # re-render the typed name only when it changes
             entering_name = True
+            # Everything but the typed name is static for the whole screen:
+            # read the scores file and render the fixed text once up front
+            # instead of once per frame.
+            card = pygame.Rect(200, 120, WIDTH-400, 420)
+            go_t = GAME_OVER_FONT.render("GAME OVER!", True, RED)
+            final = font.render(f"Final Score: {score}", True, BLACK)
+            prompt = font.render("Enter your name (press ENTER to save):", True, BLACK)
+            heading = small_font.render("Leaderboard (Top 10)", True, DARK_GRAY)
+            board_lines = [
+                small_font.render(f"{idx+1}. {entry['name']} - {entry['score']}", True, BLACK)
+                for idx, entry in enumerate(load_scores()[:10])
+            ]
+            # Characters come in through SDL's text-input path (one event
+            # per logical character, IME- and key-repeat-correct); KEYDOWN
+            # handles only the control keys. Text input is pygame's default
+            # state, so it is left enabled for the next round's rack keys.
+            pygame.key.start_text_input()
             while entering_name:
+                # Events first, so a keystroke shows up on this frame's flip
+                # instead of the next one. Like the menu, this screen only
+                # changes on input, so block in SDL until something arrives.
+                first = pygame.event.wait(1000 // FPS)
+                events = pygame.event.get()
+                if first.type != pygame.NOEVENT:
+                    events.insert(0, first)
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        return False
+                    if event.type == pygame.TEXTINPUT:
+                        for ch in event.text:
+                            if len(name) < 12 and ch in ALLOWED_NAME_CHARS:
+                                name += ch
+                    if event.type == pygame.KEYDOWN:
+                        if event.key == pygame.K_RETURN:
+                            stripped = name.strip()
+                            n = stripped[:12] if stripped else "ANON"
+                            save_score(n, score)
+                            entering_name = False
+                            return True
+                        elif event.key == pygame.K_BACKSPACE:
+                            name = name[:-1]
+
+                # Only the typed name can change the picture; skip the
+                # redraw and the flip entirely on timeout wakeups.
+                if name == name_shown:
+                    continue
+
                 screen.fill(PANEL_BG)
-                card = pygame.Rect(200, 120, WIDTH-400, 420)
                 pygame.draw.rect(screen, WHITE, card, border_radius=14)
                 pygame.draw.rect(screen, DARK_GRAY, card, 2, border_radius=14)
-                go_t = pygame.font.Font(None, 64).render("GAME OVER!", True, RED)
                 screen.blit(go_t, go_t.get_rect(center=(WIDTH//2, 180)))
-                final = font.render(f"Final Score: {score}", True, BLACK)
                 screen.blit(final, final.get_rect(center=(WIDTH//2, 240)))
-                prompt = font.render("Enter your name (press ENTER to save):", True, BLACK)
                 screen.blit(prompt, (card.x + 40, 300))
-                name_render = font.render(name, True, BLUE)
+                if name != name_shown:
+                    name_render = font.render(name, True, BLUE)
+                    name_shown = name
                 screen.blit(name_render, (card.x + 40, 340))
 
                 # leaderboard
-                scores_list = load_scores()
-                heading = small_font.render("Leaderboard (Top 10)", True, DARK_GRAY)
                 screen.blit(heading, (card.x + 40, 380))
-                for idx, entry in enumerate(scores_list[:10]):
-                    text = small_font.render(f"{idx+1}. {entry['name']} - {entry['score']}", True, BLACK)
-                    screen.blit(text, (card.x + 40, 410 + idx*26))
+                for idx, line in enumerate(board_lines):
+                    screen.blit(line, (card.x + 40, 410 + idx*26))
 
                 pygame.display.flip()
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        return
-                    if event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_RETURN:
-                            if name.strip() == "":
-                                n = "ANON"
-                            else:
-                                n = name.strip()[:12]
-                            save_score(n, score)
-                            entering_name = False
-                            return
-                        elif event.key == pygame.K_BACKSPACE:
-                            name = name[:-1]
-                        else:
-                            ch = event.unicode
-                            if ch.isprintable() and len(name) < 12:
-                                name += ch
                 clock.tick(FPS)
         
         pygame.display.flip()
-        clock.tick(FPS)
-    pygame.quit()
-    sys.exit()
+        # Nothing animates on an idle board, so halve the frame rate until a
+        # message, floating score or reveal animation needs smooth updates.
+        idle = not floating_texts and message_timer <= 0 and not reveal_animations
+        clock.tick(FPS // 2 if idle else FPS)
+    return False
 # -------------------------------------------
 
 # ---------------- App Entrypoint ----------------
 def run():
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    # Let the display pace presentation when it can; vsync is only honored
+    # on the SCALED path, so fall back to the plain double-buffered surface
+    # if the driver refuses it. clock.tick stays as the safety cap.
+    # TT_VSYNC=0 opts out for players who prefer lower input latency over
+    # tear-free frames.
+    vsync = int(os.environ.get("TT_VSYNC", "1"))
+    try:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.DOUBLEBUF, vsync=vsync)
+    except pygame.error:
+        screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.DOUBLEBUF | pygame.HWSURFACE)
     pygame.display.set_caption("Text Twist")
     clock = pygame.time.Clock()
-    font = pygame.font.Font(None, FONT_SIZE)
-    small_font = pygame.font.Font(None, FONT_SIZE - 6)
-    big_font = pygame.font.Font(None, 56)
-    fonts = (font, small_font, big_font)
+    fonts = (FONT, SMALL_FONT, BIG_FONT)
 
+    # The menu returns None and main_game returns False when the player
+    # closes the window; either way teardown happens here, in one place.
     while True:
         chosen_length = difficulty_menu(screen, clock, fonts)
-        main_game(chosen_length)
+        if chosen_length is None:
+            break
+        if not main_game(screen, clock, fonts, chosen_length):
+            break
+    pygame.quit()
 
 if __name__ == "__main__":
     run()